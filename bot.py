@@ -565,9 +565,9 @@ async def reminder_actions(callback: CallbackQuery) -> None:
     if action != "delete":
         await callback.answer()
         return
-    await db_manager.archive_reminder(reminder_id)
-    await db_manager.mark_alerts_fired_for_reminder(reminder_id)
+    # The scheduler finds jobs through the still-unfired alerts, so drop them first.
     await scheduler.remove_alerts_for_reminder(reminder_id)
+    await db_manager.archive_reminder_and_silence(reminder_id)
     await callback.message.edit_text("🗑 Напоминание перемещено в архив.")
     await callback.answer()
 
@@ -880,6 +880,7 @@ async def main() -> None:
     async def on_shutdown() -> None:
         if scheduler:
             await scheduler.shutdown()
+        await db_manager.close()
         await bot.session.close()
 
     await dp.start_polling(bot, on_startup=on_startup, on_shutdown=on_shutdown)
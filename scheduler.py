@@ -122,14 +122,11 @@ class SchedulerManager:
         return f"alert:{alert_id}"
 
     async def _fire_alert(self, alert_id: int) -> None:
-        data = await self._db.get_alert_with_reminder(alert_id)
+        data = await self._db.claim_alert(alert_id)
         if not data:
             return
         alert, reminder = data
-        if reminder.archived:
-            await self._db.mark_alert_fired(alert.id)
-            return
-        local_time = reminder.event_ts_utc.astimezone(KYIV)
+        local_time = reminder.event_ts_utc.astimezone(KYIV_TZ)
         try:
             await self._bot.send_message(
                 chat_id=reminder.chat_id,
@@ -141,8 +138,6 @@ class SchedulerManager:
             )
         except Exception:  # pragma: no cover - logging only
             logger.exception("Failed to deliver alert %s", alert.id)
-        finally:
-            await self._db.mark_alert_fired(alert.id)
 
     async def _send_review_prompt(self, chat_id: int, user_id: int, tz_key: str) -> None:
         tz = ZoneInfo(tz_key)
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import sqlite3
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from datetime import date, datetime, timedelta
+from functools import lru_cache
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Optional, Sequence, Tuple
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
 
 import aiosqlite
 from zoneinfo import ZoneInfo
@@ -12,6 +16,33 @@ from zoneinfo import ZoneInfo
 UTC = ZoneInfo("UTC")
 logger = logging.getLogger(__name__)
 
+# sqlite3 keeps an LRU of prepared statements per connection (100 by default);
+# the module issues a few dozen distinct SQL strings, so give it some headroom.
+STATEMENT_CACHE_SIZE = 256
+
+# Upper bound of long-lived read-only connections kept open by a DBManager,
+# on top of its single writer connection.
+POOL_SIZE = 4
+
+# Connection-scoped settings (journal_mode=WAL is persistent and set in init()),
+# applied once when a pooled connection is opened. synchronous=NORMAL is
+# durable enough under WAL and skips an fsync per commit; the cache and mmap
+# sizing pay off because the connection, and so its page cache, stays open.
+CONNECTION_PRAGMAS = """
+PRAGMA foreign_keys = ON;
+PRAGMA synchronous = NORMAL;
+PRAGMA temp_store = MEMORY;
+PRAGMA cache_size = -65536;
+PRAGMA mmap_size = 268435456;
+"""
+
+_MAX_ROWID = 2**63 - 1
+# Bounds that sort before / after every ISO-8601 timestamp written by _to_iso.
+_MIN_ISO = ""
+_MAX_ISO = "9999-12-31"
+# Indexed by a stored 0/1 ``archived`` / ``fired`` flag.
+_FLAGS = (False, True)
+
 
 # --- dataclasses ----------------------------------------------------------------
 
@@ -26,6 +57,20 @@ class Reminder:
     created_utc: datetime
     archived: bool
 
+    @classmethod
+    def _from_row(cls, row: Sequence) -> Reminder:
+        """Build from ``(id, chat_id, user_id, text, event_ts_utc, created_utc, archived)``."""
+
+        obj = object.__new__(cls)
+        obj.id = row[0]
+        obj.chat_id = row[1]
+        obj.user_id = row[2]
+        obj.text = row[3]
+        obj.event_ts_utc = _parse_utc(row[4])
+        obj.created_utc = _parse_utc(row[5])
+        obj.archived = _FLAGS[row[6]]
+        return obj
+
 
 @dataclass(slots=True)
 class Alert:
@@ -34,6 +79,17 @@ class Alert:
     fire_ts_utc: datetime
     fired: bool
 
+    @classmethod
+    def _from_row(cls, row: Sequence) -> Alert:
+        """Build from ``(id, reminder_id, fire_ts_utc, fired)``."""
+
+        obj = object.__new__(cls)
+        obj.id = row[0]
+        obj.reminder_id = row[1]
+        obj.fire_ts_utc = _parse_utc(row[2])
+        obj.fired = _FLAGS[row[3]]
+        return obj
+
 
 @dataclass(slots=True)
 class Task:
@@ -44,6 +100,19 @@ class Task:
     created_utc: datetime
     archived: bool
 
+    @classmethod
+    def _from_row(cls, row: Sequence) -> Task:
+        """Build from ``(id, chat_id, user_id, text, created_utc, archived)``."""
+
+        obj = object.__new__(cls)
+        obj.id = row[0]
+        obj.chat_id = row[1]
+        obj.user_id = row[2]
+        obj.text = row[3]
+        obj.created_utc = _parse_utc(row[4])
+        obj.archived = _FLAGS[row[5]]
+        return obj
+
 
 @dataclass(slots=True)
 class ShoppingItem:
@@ -54,6 +123,19 @@ class ShoppingItem:
     created_utc: datetime
     archived: bool
 
+    @classmethod
+    def _from_row(cls, row: Sequence) -> ShoppingItem:
+        """Build from ``(id, chat_id, user_id, text, created_utc, archived)``."""
+
+        obj = object.__new__(cls)
+        obj.id = row[0]
+        obj.chat_id = row[1]
+        obj.user_id = row[2]
+        obj.text = row[3]
+        obj.created_utc = _parse_utc(row[4])
+        obj.archived = _FLAGS[row[5]]
+        return obj
+
 
 @dataclass(slots=True)
 class Ritual:
@@ -64,6 +146,19 @@ class Ritual:
     preset_key: Optional[str]
     created_utc: datetime
 
+    @classmethod
+    def _from_row(cls, row: Sequence) -> Ritual:
+        """Build from ``(id, chat_id, user_id, text, created_utc)``."""
+
+        obj = object.__new__(cls)
+        obj.id = row[0]
+        obj.chat_id = row[1]
+        obj.user_id = row[2]
+        obj.text = row[3]
+        obj.preset_key = None
+        obj.created_utc = _parse_utc(row[4])
+        return obj
+
 
 @dataclass(slots=True)
 class DailyPlanItem:
@@ -109,57 +204,242 @@ class KnownUser:
 
 
 def _ensure_tz(dt: datetime) -> datetime:
-    if dt.tzinfo is None:
+    tz = dt.tzinfo
+    # Callers almost always pass UTC already (ZoneInfo caches the instance, and
+    # parsed "+00:00" values carry timezone.utc); skip the conversion then.
+    if tz is UTC or tz is timezone.utc:
+        return dt
+    if tz is None:
         return dt.replace(tzinfo=UTC)
     return dt.astimezone(UTC)
 
 
+@lru_cache(maxsize=8192)
+def _parse_utc(text: str) -> datetime:
+    # _to_iso always writes an explicit offset, so fromisoformat already
+    # returns an aware value; only offset-less legacy rows need UTC attached.
+    # Cached because list rows often repeat a timestamp (alerts of one
+    # reminder, items added together); datetimes are immutable, so sharing
+    # one is safe.
+    dt = datetime.fromisoformat(text)
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=UTC)
+    return dt
+
+
+@lru_cache(maxsize=256)
+def _tz(name: str) -> ZoneInfo:
+    # Profiles mostly share a handful of zone names; resolve each one once.
+    try:
+        return ZoneInfo(name)
+    except Exception:  # pragma: no cover - fallback
+        return ZoneInfo("Europe/Kyiv")
+
+
 def _to_iso(dt: datetime) -> str:
     return _ensure_tz(dt).isoformat()
 
 
+# Maps a bool flag to the 0/1 stored in ``archived`` / ``fired`` columns.
+_bool_to_int = (0, 1).__getitem__
+
+
 def _to_epoch(dt: datetime) -> int:
-    return int(_ensure_tz(dt).timestamp())
-
-
-def _from_storage_timestamp(value: object) -> datetime:
-    if value is None:
-        raise ValueError("timestamp value is None")
-    if isinstance(value, (int, float)):
-        return datetime.fromtimestamp(int(value), tz=UTC)
-    if isinstance(value, bytes):
-        value = value.decode("utf-8")
-    if isinstance(value, str):
-        text = value.strip()
-        if not text:
-            raise ValueError("empty timestamp value")
-        if text.isdigit() or (text.startswith("-") and text[1:].isdigit()):
-            return datetime.fromtimestamp(int(text), tz=UTC)
-        try:
-            return datetime.fromisoformat(text).replace(tzinfo=UTC)
-        except ValueError:
-            pass
-        try:
-            return datetime.fromtimestamp(int(float(text)), tz=UTC)
-        except ValueError as exc:  # pragma: no cover - defensive
-            raise ValueError(f"Cannot parse timestamp value: {value!r}") from exc
-    raise TypeError(f"Unsupported timestamp type: {type(value)!r}")
+    # timestamp() of an aware datetime does not depend on its zone, so only
+    # naive values need UTC attached.
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=UTC)
+    return int(dt.timestamp())
+
+
+def _keyset_bound(before_id: Optional[int]) -> int:
+    # Keeps the ``id < ?`` predicate (and so the SQL text) the same for the
+    # first page, which has no cursor yet.
+    return _MAX_ROWID if before_id is None else before_id
+
+
+# --- row factories --------------------------------------------------------------
+#
+# Installed on individual cursors so rows are turned into dataclasses inside
+# sqlite3's fetch loop, without an intermediate aiosqlite.Row. The dataclass
+# ``_from_row`` constructors index positionally, so the matching SELECT must
+# list columns in the documented order.
+
+
+def _reminder_row(cursor: sqlite3.Cursor, row: tuple) -> Reminder:
+    return Reminder._from_row(row)
+
+
+def _alert_row(cursor: sqlite3.Cursor, row: tuple) -> Alert:
+    return Alert._from_row(row)
+
+
+def _alert_pair_row(cursor: sqlite3.Cursor, row: tuple) -> Tuple[Alert, Reminder]:
+    # alert columns first, then the joined reminder's
+    return Alert._from_row(row), Reminder._from_row(row[4:])
+
+
+def _task_row(cursor: sqlite3.Cursor, row: tuple) -> Task:
+    return Task._from_row(row)
+
+
+def _shopping_row(cursor: sqlite3.Cursor, row: tuple) -> ShoppingItem:
+    return ShoppingItem._from_row(row)
+
+
+def _ritual_row(cursor: sqlite3.Cursor, row: tuple) -> Ritual:
+    return Ritual._from_row(row)
 
 
 # --- database manager -----------------------------------------------------------
 
 
 class DBManager:
-    def __init__(self, db_path: Path) -> None:
+    def __init__(self, db_path: Path, *, pool_size: int = POOL_SIZE) -> None:
         self._db_path = Path(db_path)
+        self._pool_size = pool_size
+        # Opened plus currently opening; counted before the await so that
+        # concurrent callers cannot overshoot pool_size.
+        self._opened = 0
+        self._connections: List[aiosqlite.Connection] = []
+        self._idle: Optional[asyncio.LifoQueue[aiosqlite.Connection]] = None
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._write_lock: Optional[asyncio.Lock] = None
 
     @property
     def db_path(self) -> Path:
         return self._db_path
 
+    async def close(self) -> None:
+        """Close every pooled connection; the pool reopens lazily if used again."""
+
+        connections, self._connections = self._connections, []
+        if self._writer is not None:
+            connections.append(self._writer)
+        self._writer = None
+        self._opened = 0
+        self._idle = None
+        for db in connections:
+            await db.close()
+
+    async def _open_connection(self, *, readonly: bool = False) -> aiosqlite.Connection:
+        """Open a connection configured once for every query it will run.
+
+        Rows come back as plain tuples; readers index them positionally or
+        install one of the typed row factories above on their cursor.
+        """
+
+        if readonly:
+            target = f"{self._db_path.absolute().as_uri()}?mode=ro"
+        else:
+            target = str(self._db_path)
+        db = await aiosqlite.connect(
+            target, uri=readonly, cached_statements=STATEMENT_CACHE_SIZE
+        )
+        try:
+            await db.executescript(CONNECTION_PRAGMAS)
+        except BaseException:
+            await db.close()
+            raise
+        return db
+
+    @asynccontextmanager
+    async def _connection(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a pooled read-only connection, opening one while under ``pool_size``.
+
+        Connections stay open between calls, so their page cache, statement
+        cache and PRAGMA setup are reused instead of rebuilt per query. Under
+        WAL they read a consistent snapshot without waiting for the writer.
+        """
+
+        if self._idle is None:
+            self._idle = asyncio.LifoQueue()
+        idle = self._idle
+        if idle.empty() and self._opened < self._pool_size:
+            self._opened += 1
+            try:
+                db = await self._open_connection(readonly=True)
+            except BaseException:
+                self._opened -= 1
+                raise
+            self._connections.append(db)
+        else:
+            db = await idle.get()
+        try:
+            yield db
+        finally:
+            # After close() the connection is already shut; just drop it.
+            if self._idle is idle:
+                if db.in_transaction:
+                    await db.rollback()
+                idle.put_nowait(db)
+
+    @asynccontextmanager
+    async def _write_connection(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Hold the single writer connection; writers queue here, not on SQLite's lock."""
+
+        if self._write_lock is None:
+            self._write_lock = asyncio.Lock()
+        async with self._write_lock:
+            if self._writer is None:
+                self._writer = await self._open_connection()
+            yield self._writer
+
+    @asynccontextmanager
+    async def _transaction(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Run a write under ``BEGIN IMMEDIATE``; commit on success, roll back on error.
+
+        Taking the write lock up front means a competing writer is waited out
+        (up to sqlite3's default 5 s connect ``timeout``) before any statement
+        runs, instead of failing with SQLITE_BUSY halfway through.
+        """
+
+        async with self._write_connection() as db:
+            await db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+            except BaseException:
+                await db.rollback()
+                raise
+            await db.commit()
+
+    async def _execute_for_ids(self, sql: str, ids: Sequence[int]) -> None:
+        """Run ``sql`` once for all ``ids``; ``{ids}`` expands to the placeholders."""
+
+        if not ids:
+            return
+        async with self._transaction() as db:
+            await db.execute(sql.format(ids=", ".join("?" * len(ids))), tuple(ids))
+
+    @staticmethod
+    async def _insert_alerts(
+        db: aiosqlite.Connection, reminder_id: int, fire_times: Sequence[datetime]
+    ) -> List[Alert]:
+        """Insert all alerts of a reminder with one multi-row INSERT.
+
+        Rowids within a single INSERT are handed out in VALUES order, so the
+        sorted RETURNING ids line up with ``fire_times``.
+        """
+
+        if not fire_times:
+            return []
+        params: List[object] = []
+        for fire_ts in fire_times:
+            params += (reminder_id, _to_iso(fire_ts))
+        values = ", ".join(["(?, ?)"] * len(fire_times))
+        async with db.execute(
+            f"INSERT INTO alerts (reminder_id, fire_ts_utc) VALUES {values} RETURNING id",
+            params,
+        ) as cursor:
+            alert_ids = sorted(row[0] for row in await cursor.fetchall())
+        return [
+            Alert(id=alert_id, reminder_id=reminder_id, fire_ts_utc=fire_ts, fired=False)
+            for alert_id, fire_ts in zip(alert_ids, fire_times)
+        ]
+
     async def init(self) -> None:
         self._db_path.parent.mkdir(parents=True, exist_ok=True)
-        async with aiosqlite.connect(self._db_path) as db:
+        async with self._write_connection() as db:
             await db.executescript(
                 """
                 PRAGMA journal_mode=WAL;
@@ -206,58 +486,72 @@ class DBManager:
                     text TEXT NOT NULL,
                     created_utc TEXT NOT NULL
                 );
+
+                CREATE TABLE IF NOT EXISTS user_profiles (
+                    chat_id INTEGER NOT NULL,
+                    user_id INTEGER NOT NULL,
+                    timezone TEXT NOT NULL DEFAULT 'Europe/Kyiv',
+                    PRIMARY KEY (chat_id, user_id)
+                );
+
+                CREATE TABLE IF NOT EXISTS daily_review (
+                    id INTEGER PRIMARY KEY,
+                    chat_id INTEGER NOT NULL,
+                    user_id INTEGER NOT NULL,
+                    date_ymd TEXT NOT NULL,
+                    mit_done TEXT NOT NULL,
+                    mood INTEGER NOT NULL,
+                    gratitude TEXT NOT NULL,
+                    notes TEXT NOT NULL,
+                    created_ts_utc INTEGER NOT NULL,
+                    UNIQUE (chat_id, user_id, date_ymd)
+                );
+
+                -- One index per list/range query, in predicate-then-ORDER BY order,
+                -- so each is a range seek that already returns rows sorted.
+                CREATE INDEX IF NOT EXISTS ix_reminders_user_range
+                    ON reminders (chat_id, user_id, archived, event_ts_utc, id);
+                -- Partial: only unfired alerts are ever looked up by time, and
+                -- fired ones pile up, so leave them out of the index.
+                CREATE INDEX IF NOT EXISTS ix_alerts_unfired
+                    ON alerts (fire_ts_utc) WHERE fired = 0;
+                -- Also serves the ON DELETE CASCADE lookup from reminders.
+                CREATE INDEX IF NOT EXISTS ix_alerts_reminder ON alerts (reminder_id, fired);
+                CREATE INDEX IF NOT EXISTS ix_tasks_user ON tasks (chat_id, user_id, archived, id);
+                CREATE INDEX IF NOT EXISTS ix_shopping_user
+                    ON shopping (chat_id, user_id, archived, id);
+                CREATE INDEX IF NOT EXISTS ix_rituals_user ON rituals (chat_id, user_id, id);
+                """
+            )
+            await db.commit()
+
+    # --- users --------------------------------------------------------------------
+
+    async def ensure_user_profile(self, chat_id: int, user_id: int) -> bool:
+        async with self._transaction() as db:
+            cur = await db.execute(
                 """
                 INSERT OR IGNORE INTO user_profiles (chat_id, user_id, timezone)
                 VALUES (?, ?, 'Europe/Kyiv')
                 """,
                 (chat_id, user_id),
             )
-            await db.commit()
             inserted = cur.rowcount > 0
             await cur.close()
         return inserted
 
     async def get_known_users(self) -> List[KnownUser]:
-        async with aiosqlite.connect(self._db_path) as db:
-            db.row_factory = aiosqlite.Row
-            async with db.execute("SELECT * FROM user_profiles") as cursor:
-                rows = await cursor.fetchall()
         result: List[KnownUser] = []
-        for row in rows:
-            try:
-                tz = ZoneInfo(row["timezone"])
-            except Exception:  # pragma: no cover - fallback
-                tz = ZoneInfo("Europe/Kyiv")
-            result.append(KnownUser(chat_id=row["chat_id"], user_id=row["user_id"], timezone=tz))
+        async with self._connection() as db:
+            async with db.execute("SELECT chat_id, user_id, timezone FROM user_profiles") as cursor:
+                async for chat_id, user_id, timezone in cursor:
+                    result.append(
+                        KnownUser(chat_id=chat_id, user_id=user_id, timezone=_tz(timezone))
+                    )
         return result
 
     # --- reminders ----------------------------------------------------------------
 
-    # --- helpers -----------------------------------------------------------------
-
-    @staticmethod
-    def _row_to_reminder(row: aiosqlite.Row) -> Reminder:
-        return Reminder(
-            id=row["id"],
-            chat_id=row["chat_id"],
-            user_id=row["user_id"],
-            text=row["text"],
-            event_ts_utc=datetime.fromisoformat(row["event_ts_utc"]).replace(tzinfo=UTC),
-            created_utc=datetime.fromisoformat(row["created_utc"]).replace(tzinfo=UTC),
-            archived=bool(row["archived"]),
-        )
-
-    @staticmethod
-    def _row_to_alert(row: aiosqlite.Row) -> Alert:
-        return Alert(
-            id=row["id"],
-            reminder_id=row["reminder_id"],
-            fire_ts_utc=datetime.fromisoformat(row["fire_ts_utc"]).replace(tzinfo=UTC),
-            fired=bool(row["fired"]),
-        )
-
-    # --- reminders ----------------------------------------------------------------
-
     async def create_reminder(
         self,
         *,
@@ -268,35 +562,16 @@ class DBManager:
         created_utc: datetime,
         alert_times_utc: Sequence[datetime],
     ) -> Tuple[Reminder, List[Alert]]:
-        async with aiosqlite.connect(self._db_path) as db:
-            await db.execute("PRAGMA foreign_keys = ON")
-            cur = await db.execute(
+        reminder_params = (chat_id, user_id, text, _to_iso(event_ts_utc), _to_iso(created_utc))
+        async with self._transaction() as db:
+            (reminder_id,) = await db.execute_insert(
                 """
                 INSERT INTO reminders (chat_id, user_id, text, event_ts_utc, created_utc)
                 VALUES (?, ?, ?, ?, ?)
                 """,
-                (chat_id, user_id, text, _to_iso(event_ts_utc), _to_iso(created_utc)),
+                reminder_params,
             )
-            reminder_id = cur.lastrowid
-            await cur.close()
-
-            alerts: List[Alert] = []
-            for fire_ts in alert_times_utc:
-                alert_cur = await db.execute(
-                    "INSERT INTO alerts (reminder_id, fire_ts_utc) VALUES (?, ?)",
-                    (reminder_id, fire_ts.isoformat()),
-                )
-                alerts.append(
-                    Alert(
-                        id=alert_cur.lastrowid,
-                        reminder_id=reminder_id,
-                        fire_ts_utc=fire_ts,
-                        fired=False,
-                    )
-                )
-                await alert_cur.close()
-
-            await db.commit()
+            alerts = await self._insert_alerts(db, reminder_id, alert_times_utc)
 
         reminder = Reminder(
             id=reminder_id,
@@ -310,16 +585,16 @@ class DBManager:
         return reminder, alerts
 
     async def get_reminder(self, reminder_id: int) -> Optional[Reminder]:
-        async with aiosqlite.connect(self._db_path) as db:
-            db.row_factory = aiosqlite.Row
+        async with self._connection() as db:
             async with db.execute(
-                "SELECT * FROM reminders WHERE id = ?",
+                """
+                SELECT id, chat_id, user_id, text, event_ts_utc, created_utc, archived
+                FROM reminders WHERE id = ?
+                """,
                 (reminder_id,),
             ) as cursor:
-                row = await cursor.fetchone()
-        if not row:
-            return None
-        return self._row_to_reminder(row)
+                cursor.row_factory = _reminder_row
+                return await cursor.fetchone()
 
     async def get_reminders_for_range(
         self,
@@ -329,171 +604,177 @@ class DBManager:
         start_utc: Optional[datetime],
         end_utc: Optional[datetime],
         archived: bool,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, int]] = None,
     ) -> List[Reminder]:
-        clauses = ["chat_id = ?", "user_id = ?", "archived = ?"]
-        params: List[object] = [chat_id, user_id, 1 if archived else 0]
-        if start_utc is not None:
-            clauses.append("event_ts_utc >= ?")
-            params.append(start_utc.isoformat())
-        if end_utc is not None:
-            clauses.append("event_ts_utc < ?")
-            params.append(end_utc.isoformat())
-        where = " AND ".join(clauses)
-
-        async with aiosqlite.connect(self._db_path) as db:
-            db.row_factory = aiosqlite.Row
+        """Return reminders ordered by ``(event_ts_utc, id)``.
+
+        Pages are keyset-based: pass the ``(event_ts_utc, id)`` of the last
+        reminder of the previous page as ``after`` to continue from it.
+        """
+
+        # Open bounds are bound as sentinels rather than dropped from the SQL,
+        # so every call shares one cached statement and the range predicates
+        # stay usable by an index.
+        after_ts, after_id = (_MIN_ISO, 0) if after is None else (_to_iso(after[0]), after[1])
+        params = (
+            chat_id,
+            user_id,
+            _bool_to_int(archived),
+            _MIN_ISO if start_utc is None else _to_iso(start_utc),
+            _MAX_ISO if end_utc is None else _to_iso(end_utc),
+            after_ts,
+            after_id,
+            -1 if limit is None else limit,
+        )
+
+        async with self._connection() as db:
             async with db.execute(
-                f"SELECT * FROM reminders WHERE {where} ORDER BY event_ts_utc",
+                """
+                SELECT id, chat_id, user_id, text, event_ts_utc, created_utc, archived
+                FROM reminders
+                WHERE chat_id = ? AND user_id = ? AND archived = ?
+                  AND event_ts_utc >= ? AND event_ts_utc < ?
+                  AND (event_ts_utc, id) > (?, ?)
+                ORDER BY event_ts_utc, id
+                LIMIT ?
+                """,
                 params,
             ) as cursor:
-                rows = await cursor.fetchall()
-        return [self._row_to_reminder(row) for row in rows]
+                cursor.row_factory = _reminder_row
+                return await cursor.fetchall()
 
     async def archive_reminder(self, reminder_id: int) -> None:
-        async with aiosqlite.connect(self._db_path) as db:
+        await self.archive_reminders([reminder_id])
+
+    async def archive_reminders(self, reminder_ids: Sequence[int]) -> None:
+        await self._execute_for_ids(
+            "UPDATE reminders SET archived = 1 WHERE id IN ({ids})", reminder_ids
+        )
+
+    async def archive_reminder_and_silence(self, reminder_id: int) -> None:
+        """Archive a reminder and mark its pending alerts fired in one transaction."""
+
+        async with self._transaction() as db:
+            await db.execute("UPDATE reminders SET archived = 1 WHERE id = ?", (reminder_id,))
             await db.execute(
-                "UPDATE reminders SET archived = 1 WHERE id = ?",
+                "UPDATE alerts SET fired = 1 WHERE reminder_id = ? AND fired = 0",
                 (reminder_id,),
             )
-            await db.commit()
 
     async def delete_reminder(self, reminder_id: int) -> None:
-        async with aiosqlite.connect(self._db_path) as db:
-            await db.execute("PRAGMA foreign_keys = ON")
-            await db.execute("DELETE FROM reminders WHERE id = ?", (reminder_id,))
-            await db.commit()
+        await self.delete_reminders([reminder_id])
+
+    async def delete_reminders(self, reminder_ids: Sequence[int]) -> None:
+        await self._execute_for_ids("DELETE FROM reminders WHERE id IN ({ids})", reminder_ids)
 
     async def add_alerts(self, reminder_id: int, fire_times: Sequence[datetime]) -> List[Alert]:
-        alerts: List[Alert] = []
-        async with aiosqlite.connect(self._db_path) as db:
-            await db.execute("PRAGMA foreign_keys = ON")
-            for fire_ts in fire_times:
-                cur = await db.execute(
-                    "INSERT INTO alerts (reminder_id, fire_ts_utc) VALUES (?, ?)",
-                    (reminder_id, fire_ts.isoformat()),
-                )
-                alerts.append(
-                    Alert(
-                        id=cur.lastrowid,
-                        reminder_id=reminder_id,
-                        fire_ts_utc=fire_ts,
-                        fired=False,
-                    )
-                )
-                await cur.close()
-            await db.commit()
-        return alerts
+        if not fire_times:
+            return []
+        async with self._transaction() as db:
+            return await self._insert_alerts(db, reminder_id, fire_times)
 
     async def get_alert_with_reminder(self, alert_id: int) -> Optional[Tuple[Alert, Reminder]]:
-        async with aiosqlite.connect(self._db_path) as db:
-            db.row_factory = aiosqlite.Row
+        async with self._connection() as db:
             async with db.execute(
                 """
-                SELECT a.id as a_id, a.reminder_id, a.fire_ts_utc, a.fired,
-                       r.id as r_id, r.chat_id, r.user_id, r.text, r.event_ts_utc, r.created_utc, r.archived
+                SELECT a.id, a.reminder_id, a.fire_ts_utc, a.fired,
+                       r.id, r.chat_id, r.user_id, r.text, r.event_ts_utc, r.created_utc, r.archived
                 FROM alerts a
                 JOIN reminders r ON r.id = a.reminder_id
                 WHERE a.id = ?
                 """,
                 (alert_id,),
             ) as cursor:
-                row = await cursor.fetchone()
-        if not row:
-            return None
-        alert = Alert(
-            id=row["a_id"],
-            reminder_id=row["reminder_id"],
-            fire_ts_utc=datetime.fromisoformat(row["fire_ts_utc"]).replace(tzinfo=UTC),
-            fired=bool(row["fired"]),
-        )
-        reminder = Reminder(
-            id=row["r_id"],
-            chat_id=row["chat_id"],
-            user_id=row["user_id"],
-            text=row["text"],
-            event_ts_utc=datetime.fromisoformat(row["event_ts_utc"]).replace(tzinfo=UTC),
-            created_utc=datetime.fromisoformat(row["created_utc"]).replace(tzinfo=UTC),
-            archived=bool(row["archived"]),
-        )
-        return alert, reminder
+                cursor.row_factory = _alert_pair_row
+                return await cursor.fetchone()
+
+    async def claim_alert(self, alert_id: int) -> Optional[Tuple[Alert, Reminder]]:
+        """Mark an alert fired and return it with its reminder in one transaction.
+
+        Returns ``None`` when the alert does not exist or was already claimed,
+        so concurrent deliveries of the same alert cannot both succeed. Also
+        returns ``None`` for an archived reminder: the alert is still marked
+        fired, but nothing is loaded or parsed.
+        """
+
+        async with self._transaction() as db:
+            cur = await db.execute(
+                "UPDATE alerts SET fired = 1 WHERE id = ? AND fired = 0",
+                (alert_id,),
+            )
+            claimed = cur.rowcount > 0
+            await cur.close()
+            if not claimed:
+                return None
+            async with db.execute(
+                """
+                SELECT a.id, a.reminder_id, a.fire_ts_utc, a.fired,
+                       r.id, r.chat_id, r.user_id, r.text, r.event_ts_utc, r.created_utc, r.archived
+                FROM alerts a
+                JOIN reminders r ON r.id = a.reminder_id
+                WHERE a.id = ? AND r.archived = 0
+                """,
+                (alert_id,),
+            ) as cursor:
+                cursor.row_factory = _alert_pair_row
+                return await cursor.fetchone()
 
     async def get_pending_alerts(self, now_utc: datetime) -> List[Tuple[Alert, Reminder]]:
-        async with aiosqlite.connect(self._db_path) as db:
-            db.row_factory = aiosqlite.Row
+        async with self._connection() as db:
             async with db.execute(
                 """
-                SELECT a.id as a_id, a.reminder_id, a.fire_ts_utc, a.fired,
-                       r.id as r_id, r.chat_id, r.user_id, r.text, r.event_ts_utc, r.created_utc, r.archived
+                SELECT a.id, a.reminder_id, a.fire_ts_utc, a.fired,
+                       r.id, r.chat_id, r.user_id, r.text, r.event_ts_utc, r.created_utc, r.archived
                 FROM alerts a
                 JOIN reminders r ON r.id = a.reminder_id
-                WHERE a.fired = 0 AND datetime(a.fire_ts_utc) > ?
+                WHERE a.fired = 0 AND a.fire_ts_utc > ?
                 ORDER BY a.fire_ts_utc ASC
                 """,
-                (now_utc.isoformat(),),
+                (_to_iso(now_utc),),
             ) as cursor:
-                rows = await cursor.fetchall()
-        result: List[Tuple[Alert, Reminder]] = []
-        for row in rows:
-            alert = Alert(
-                id=row["a_id"],
-                reminder_id=row["reminder_id"],
-                fire_ts_utc=datetime.fromisoformat(row["fire_ts_utc"]).replace(tzinfo=UTC),
-                fired=False,
-            )
-            reminder = Reminder(
-                id=row["r_id"],
-                chat_id=row["chat_id"],
-                user_id=row["user_id"],
-                text=row["text"],
-                event_ts_utc=datetime.fromisoformat(row["event_ts_utc"]).replace(tzinfo=UTC),
-                created_utc=datetime.fromisoformat(row["created_utc"]).replace(tzinfo=UTC),
-                archived=bool(row["archived"]),
-            )
-            result.append((alert, reminder))
-        return result
+                cursor.row_factory = _alert_pair_row
+                return await cursor.fetchall()
 
     async def get_active_alerts_for_reminder(self, reminder_id: int) -> List[Alert]:
-        async with aiosqlite.connect(self._db_path) as db:
-            db.row_factory = aiosqlite.Row
+        async with self._connection() as db:
             async with db.execute(
-                "SELECT * FROM alerts WHERE reminder_id = ? AND fired = 0",
+                """
+                SELECT id, reminder_id, fire_ts_utc, fired FROM alerts
+                WHERE reminder_id = ? AND fired = 0
+                """,
                 (reminder_id,),
             ) as cursor:
-                rows = await cursor.fetchall()
-        return [self._row_to_alert(row) for row in rows]
+                cursor.row_factory = _alert_row
+                return await cursor.fetchall()
 
     async def mark_alert_fired(self, alert_id: int) -> None:
-        async with aiosqlite.connect(self._db_path) as db:
-            await db.execute(
-                "UPDATE alerts SET fired = 1 WHERE id = ?",
-                (alert_id,),
-            )
-            await db.commit()
+        await self.mark_alerts_fired([alert_id])
+
+    async def mark_alerts_fired(self, alert_ids: Sequence[int]) -> None:
+        await self._execute_for_ids("UPDATE alerts SET fired = 1 WHERE id IN ({ids})", alert_ids)
 
     async def mark_alerts_fired_for_reminder(self, reminder_id: int) -> None:
-        async with aiosqlite.connect(self._db_path) as db:
+        async with self._transaction() as db:
             await db.execute(
-                "UPDATE alerts SET fired = 1 WHERE reminder_id = ?",
+                "UPDATE alerts SET fired = 1 WHERE reminder_id = ? AND fired = 0",
                 (reminder_id,),
             )
-            await db.commit()
 
     # --- tasks --------------------------------------------------------------------
 
     async def create_task(
         self, *, chat_id: int, user_id: int, text: str, created_utc: datetime
     ) -> Task:
-        async with aiosqlite.connect(self._db_path) as db:
-            cur = await db.execute(
+        params = (chat_id, user_id, text, _to_iso(created_utc))
+        async with self._transaction() as db:
+            (task_id,) = await db.execute_insert(
                 """
                 INSERT INTO tasks (chat_id, user_id, text, created_utc)
                 VALUES (?, ?, ?, ?)
                 """,
-                (chat_id, user_id, text, created_utc.isoformat()),
+                params,
             )
-            await db.commit()
-            task_id = cur.lastrowid
-            await cur.close()
         return Task(
             id=task_id,
             chat_id=chat_id,
@@ -503,58 +784,66 @@ class DBManager:
             archived=False,
         )
 
-    async def list_tasks(self, *, chat_id: int, user_id: int, archived: bool) -> List[Task]:
-        async with aiosqlite.connect(self._db_path) as db:
-            db.row_factory = aiosqlite.Row
+    async def list_tasks(
+        self,
+        *,
+        chat_id: int,
+        user_id: int,
+        archived: bool,
+        limit: Optional[int] = None,
+        before_id: Optional[int] = None,
+    ) -> List[Task]:
+        """Return tasks newest first; all of them unless ``limit`` is given.
+
+        Pass the id of the last task of the previous page as ``before_id`` to
+        fetch the next one.
+        """
+
+        async with self._connection() as db:
             async with db.execute(
                 """
-                SELECT * FROM tasks
-                WHERE chat_id = ? AND user_id = ? AND archived = ?
+                SELECT id, chat_id, user_id, text, created_utc, archived FROM tasks
+                WHERE chat_id = ? AND user_id = ? AND archived = ? AND id < ?
                 ORDER BY id DESC
+                LIMIT ?
                 """,
-                (chat_id, user_id, 1 if archived else 0),
+                (
+                    chat_id,
+                    user_id,
+                    _bool_to_int(archived),
+                    _keyset_bound(before_id),
+                    -1 if limit is None else limit,
+                ),
             ) as cursor:
-                rows = await cursor.fetchall()
-        tasks: List[Task] = []
-        for row in rows:
-            tasks.append(
-                Task(
-                    id=row["id"],
-                    chat_id=row["chat_id"],
-                    user_id=row["user_id"],
-                    text=row["text"],
-                    created_utc=datetime.fromisoformat(row["created_utc"]).replace(tzinfo=UTC),
-                    archived=bool(row["archived"]),
-                )
-            )
-        return tasks
+                cursor.row_factory = _task_row
+                return await cursor.fetchall()
 
     async def archive_task(self, task_id: int) -> None:
-        async with aiosqlite.connect(self._db_path) as db:
-            await db.execute("UPDATE tasks SET archived = 1 WHERE id = ?", (task_id,))
-            await db.commit()
+        await self.archive_tasks([task_id])
+
+    async def archive_tasks(self, task_ids: Sequence[int]) -> None:
+        await self._execute_for_ids("UPDATE tasks SET archived = 1 WHERE id IN ({ids})", task_ids)
 
     async def delete_task(self, task_id: int) -> None:
-        async with aiosqlite.connect(self._db_path) as db:
-            await db.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
-            await db.commit()
+        await self.delete_tasks([task_id])
+
+    async def delete_tasks(self, task_ids: Sequence[int]) -> None:
+        await self._execute_for_ids("DELETE FROM tasks WHERE id IN ({ids})", task_ids)
 
     # --- shopping -----------------------------------------------------------------
 
     async def create_shopping_item(
         self, *, chat_id: int, user_id: int, text: str, created_utc: datetime
     ) -> ShoppingItem:
-        async with aiosqlite.connect(self._db_path) as db:
-            cur = await db.execute(
+        params = (chat_id, user_id, text, _to_iso(created_utc))
+        async with self._transaction() as db:
+            (item_id,) = await db.execute_insert(
                 """
                 INSERT INTO shopping (chat_id, user_id, text, created_utc)
                 VALUES (?, ?, ?, ?)
                 """,
-                (chat_id, user_id, text, created_utc.isoformat()),
+                params,
             )
-            await db.commit()
-            item_id = cur.lastrowid
-            await cur.close()
         return ShoppingItem(
             id=item_id,
             chat_id=chat_id,
@@ -565,42 +854,92 @@ class DBManager:
         )
 
     async def list_shopping(
-        self, *, chat_id: int, user_id: int, archived: bool
+        self,
+        *,
+        chat_id: int,
+        user_id: int,
+        archived: bool,
+        limit: Optional[int] = None,
+        before_id: Optional[int] = None,
     ) -> List[ShoppingItem]:
-        async with aiosqlite.connect(self._db_path) as db:
-            db.row_factory = aiosqlite.Row
+        """Return shopping items newest first (see ``list_tasks``)."""
+
+        async with self._connection() as db:
             async with db.execute(
                 """
-                SELECT * FROM shopping
-                WHERE chat_id = ? AND user_id = ? AND archived = ?
+                SELECT id, chat_id, user_id, text, created_utc, archived FROM shopping
+                WHERE chat_id = ? AND user_id = ? AND archived = ? AND id < ?
                 ORDER BY id DESC
+                LIMIT ?
                 """,
-                (chat_id, user_id, 1 if archived else 0),
+                (
+                    chat_id,
+                    user_id,
+                    _bool_to_int(archived),
+                    _keyset_bound(before_id),
+                    -1 if limit is None else limit,
+                ),
             ) as cursor:
-                rows = await cursor.fetchall()
-        return [
-            ShoppingItem(
-                id=row["id"],
-                chat_id=row["chat_id"],
-                user_id=row["user_id"],
-                text=row["text"],
-                created_utc=datetime.fromisoformat(row["created_utc"]).replace(tzinfo=UTC),
-                archived=bool(row["archived"]),
-            )
-            for row in rows
-        ]
+                cursor.row_factory = _shopping_row
+                return await cursor.fetchall()
 
     async def archive_shopping_item(self, item_id: int) -> None:
-        async with aiosqlite.connect(self._db_path) as db:
-            await db.execute("UPDATE shopping SET archived = 1 WHERE id = ?", (item_id,))
-            await db.commit()
+        await self.archive_shopping_items([item_id])
+
+    async def archive_shopping_items(self, item_ids: Sequence[int]) -> None:
+        await self._execute_for_ids(
+            "UPDATE shopping SET archived = 1 WHERE id IN ({ids})", item_ids
+        )
 
     async def delete_shopping_item(self, item_id: int) -> None:
-        async with aiosqlite.connect(self._db_path) as db:
-            await db.execute("DELETE FROM shopping WHERE id = ?", (item_id,))
-            await db.commit()
+        await self.delete_shopping_items([item_id])
+
+    async def delete_shopping_items(self, item_ids: Sequence[int]) -> None:
+        await self._execute_for_ids("DELETE FROM shopping WHERE id IN ({ids})", item_ids)
+
+    # --- daily review -------------------------------------------------------------
+
+    async def upsert_daily_review(
+        self,
+        *,
+        chat_id: int,
+        user_id: int,
+        date_ymd: str,
+        mit_done: str,
+        mood: int,
+        gratitude: str,
+        notes: str,
+        created_ts_utc: datetime,
+    ) -> DailyReview:
+        async with self._transaction() as db:
+            async with db.execute(
+                """
+                INSERT INTO daily_review (
+                    chat_id, user_id, date_ymd, mit_done, mood, gratitude, notes, created_ts_utc
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (chat_id, user_id, date_ymd) DO UPDATE SET
+                    mit_done = excluded.mit_done,
+                    mood = excluded.mood,
+                    gratitude = excluded.gratitude,
+                    notes = excluded.notes,
+                    created_ts_utc = excluded.created_ts_utc
+                RETURNING id
+                """,
+                (
+                    chat_id,
+                    user_id,
+                    date_ymd,
+                    mit_done,
+                    mood,
+                    gratitude,
+                    notes,
+                    _to_epoch(created_ts_utc),
+                ),
+            ) as cursor:
+                (review_id,) = await cursor.fetchone()
         return DailyReview(
-            id=0,
+            id=review_id,
             chat_id=chat_id,
             user_id=user_id,
             date_ymd=date_ymd,
@@ -611,60 +950,57 @@ class DBManager:
             created_ts_utc=_ensure_tz(created_ts_utc),
         )
 
-    # --- notes --------------------------------------------------------------------
-
     # --- rituals ------------------------------------------------------------------
 
     async def create_ritual(
         self, *, chat_id: int, user_id: int, text: str, created_utc: datetime
     ) -> Ritual:
-        async with aiosqlite.connect(self._db_path) as db:
-            cur = await db.execute(
+        params = (chat_id, user_id, text, _to_iso(created_utc))
+        async with self._transaction() as db:
+            (ritual_id,) = await db.execute_insert(
                 """
                 INSERT INTO rituals (chat_id, user_id, text, created_utc)
                 VALUES (?, ?, ?, ?)
                 """,
-                (chat_id, user_id, text, created_utc.isoformat()),
+                params,
             )
-            await db.commit()
-            ritual_id = cur.lastrowid
-            await cur.close()
         return Ritual(
             id=ritual_id,
             chat_id=chat_id,
             user_id=user_id,
             text=text,
+            preset_key=None,
             created_utc=created_utc,
         )
 
-    async def list_rituals(self, *, chat_id: int, user_id: int, limit: int = 100) -> List[Ritual]:
-        async with aiosqlite.connect(self._db_path) as db:
-            db.row_factory = aiosqlite.Row
+    async def list_rituals(
+        self,
+        *,
+        chat_id: int,
+        user_id: int,
+        limit: int = 100,
+        before_id: Optional[int] = None,
+    ) -> List[Ritual]:
+        """Return one page of rituals, newest first (see ``list_tasks``)."""
+
+        async with self._connection() as db:
             async with db.execute(
                 """
-                SELECT * FROM rituals
-                WHERE chat_id = ? AND user_id = ?
+                SELECT id, chat_id, user_id, text, created_utc FROM rituals
+                WHERE chat_id = ? AND user_id = ? AND id < ?
                 ORDER BY id DESC
                 LIMIT ?
                 """,
-                (chat_id, user_id, limit),
+                (chat_id, user_id, _keyset_bound(before_id), limit),
             ) as cursor:
-                rows = await cursor.fetchall()
-        return [
-            Ritual(
-                id=row["id"],
-                chat_id=row["chat_id"],
-                user_id=row["user_id"],
-                text=row["text"],
-                created_utc=datetime.fromisoformat(row["created_utc"]).replace(tzinfo=UTC),
-            )
-            for row in rows
-        ]
+                cursor.row_factory = _ritual_row
+                return await cursor.fetchall()
 
     async def delete_ritual(self, ritual_id: int) -> None:
-        async with aiosqlite.connect(self._db_path) as db:
-            await db.execute("DELETE FROM rituals WHERE id = ?", (ritual_id,))
-            await db.commit()
+        await self.delete_rituals([ritual_id])
+
+    async def delete_rituals(self, ritual_ids: Sequence[int]) -> None:
+        await self._execute_for_ids("DELETE FROM rituals WHERE id IN ({ids})", ritual_ids)
 
 
 __all__ = [
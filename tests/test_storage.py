@@ -0,0 +1,397 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterator
+
+import pytest
+
+from storage import UTC, DBManager
+
+
+Runner = Callable[[Awaitable[Any]], Any]
+
+
+@pytest.fixture()
+def run() -> Iterator[Runner]:
+    # One loop per test: pooled connections outlive a single call.
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
+
+
+@pytest.fixture()
+def db(tmp_path: Path, run: Runner) -> Iterator[DBManager]:
+    manager = DBManager(tmp_path / "mentor.db")
+    run(manager.init())
+    yield manager
+    run(manager.close())
+
+
+def test_create_reminder_round_trip(db: DBManager, run: Runner) -> None:
+    event = datetime(2030, 1, 1, 12, 0, tzinfo=UTC)
+    created = datetime(2029, 12, 31, 9, 30, tzinfo=UTC)
+    alert_times = [event - timedelta(minutes=15), event - timedelta(hours=1)]
+
+    reminder, alerts = run(
+        db.create_reminder(
+            chat_id=1,
+            user_id=2,
+            text="call mom",
+            event_ts_utc=event,
+            created_utc=created,
+            alert_times_utc=alert_times,
+        )
+    )
+
+    stored = run(db.get_reminder(reminder.id))
+    assert stored == reminder
+    assert [alert.fire_ts_utc for alert in alerts] == alert_times
+    assert all(alert.reminder_id == reminder.id for alert in alerts)
+
+
+def test_add_alerts_ids_match_stored_rows(db: DBManager, run: Runner) -> None:
+    event = datetime(2030, 1, 1, 12, 0, tzinfo=UTC)
+    reminder, _ = run(
+        db.create_reminder(
+            chat_id=1,
+            user_id=2,
+            text="standup",
+            event_ts_utc=event,
+            created_utc=event,
+            alert_times_utc=[],
+        )
+    )
+    fire_times = [event - timedelta(minutes=minutes) for minutes in (5, 60, 30)]
+
+    alerts = run(db.add_alerts(reminder.id, fire_times))
+    stored = run(db.get_active_alerts_for_reminder(reminder.id))
+
+    assert [alert.fire_ts_utc for alert in alerts] == fire_times
+    assert sorted(stored, key=lambda alert: alert.id) == alerts
+    assert run(db.add_alerts(reminder.id, [])) == []
+
+
+
+def test_get_reminders_for_range_filters_bounds(db: DBManager, run: Runner) -> None:
+    base = datetime(2030, 1, 1, tzinfo=UTC)
+    for offset in range(3):
+        run(
+            db.create_reminder(
+                chat_id=1,
+                user_id=2,
+                text=f"r{offset}",
+                event_ts_utc=base + timedelta(days=offset),
+                created_utc=base,
+                alert_times_utc=[],
+            )
+        )
+
+    def texts(start: datetime | None, end: datetime | None) -> list[str]:
+        reminders = run(
+            db.get_reminders_for_range(
+                chat_id=1, user_id=2, start_utc=start, end_utc=end, archived=False
+            )
+        )
+        return [reminder.text for reminder in reminders]
+
+    assert texts(None, None) == ["r0", "r1", "r2"]
+    assert texts(base + timedelta(days=1), None) == ["r1", "r2"]
+    assert texts(None, base + timedelta(days=1)) == ["r0"]
+    assert texts(base + timedelta(days=1), base + timedelta(days=2)) == ["r1"]
+
+
+def test_archive_reminder_hides_it_from_active_list(db: DBManager, run: Runner) -> None:
+    now = datetime(2030, 1, 1, tzinfo=UTC)
+    reminder, _ = run(
+        db.create_reminder(
+            chat_id=1,
+            user_id=2,
+            text="dentist",
+            event_ts_utc=now,
+            created_utc=now,
+            alert_times_utc=[now - timedelta(hours=1)],
+        )
+    )
+    run(db.archive_reminder(reminder.id))
+    run(db.mark_alerts_fired_for_reminder(reminder.id))
+
+    active = run(
+        db.get_reminders_for_range(
+            chat_id=1, user_id=2, start_utc=None, end_utc=None, archived=False
+        )
+    )
+    archived = run(
+        db.get_reminders_for_range(
+            chat_id=1, user_id=2, start_utc=None, end_utc=None, archived=True
+        )
+    )
+    assert active == []
+    assert [item.id for item in archived] == [reminder.id]
+    assert run(db.get_active_alerts_for_reminder(reminder.id)) == []
+
+
+def test_archive_reminder_and_silence_updates_both_tables(db: DBManager, run: Runner) -> None:
+    now = datetime(2030, 1, 1, tzinfo=UTC)
+    reminder, _ = run(
+        db.create_reminder(
+            chat_id=1,
+            user_id=2,
+            text="dentist",
+            event_ts_utc=now,
+            created_utc=now,
+            alert_times_utc=[now - timedelta(hours=1), now - timedelta(minutes=10)],
+        )
+    )
+
+    run(db.archive_reminder_and_silence(reminder.id))
+
+    stored = run(db.get_reminder(reminder.id))
+    assert stored is not None and stored.archived is True
+    assert run(db.get_active_alerts_for_reminder(reminder.id)) == []
+
+
+
+def test_tasks_are_listed_newest_first_and_archived(db: DBManager, run: Runner) -> None:
+    now = datetime(2030, 1, 1, tzinfo=UTC)
+    first = run(db.create_task(chat_id=1, user_id=2, text="a", created_utc=now))
+    second = run(db.create_task(chat_id=1, user_id=2, text="b", created_utc=now))
+    run(db.archive_task(first.id))
+
+    active = run(db.list_tasks(chat_id=1, user_id=2, archived=False))
+    archived = run(db.list_tasks(chat_id=1, user_id=2, archived=True))
+
+    assert active == [second]
+    assert [task.id for task in archived] == [first.id]
+    assert archived[0].created_utc == now
+
+
+def test_shopping_and_rituals_round_trip(db: DBManager, run: Runner) -> None:
+    now = datetime(2030, 1, 1, tzinfo=UTC)
+    item = run(db.create_shopping_item(chat_id=1, user_id=2, text="milk", created_utc=now))
+    ritual = run(db.create_ritual(chat_id=1, user_id=2, text="breathe", created_utc=now))
+
+    assert run(db.list_shopping(chat_id=1, user_id=2, archived=False)) == [item]
+    assert run(db.list_rituals(chat_id=1, user_id=2)) == [ritual]
+
+    run(db.delete_shopping_item(item.id))
+    run(db.delete_ritual(ritual.id))
+
+    assert run(db.list_shopping(chat_id=1, user_id=2, archived=False)) == []
+    assert run(db.list_rituals(chat_id=1, user_id=2)) == []
+
+
+def test_upsert_daily_review_overwrites_same_day(db: DBManager, run: Runner) -> None:
+    now = datetime(2030, 1, 1, 21, 0, tzinfo=UTC)
+    common = dict(chat_id=1, user_id=2, date_ymd="2030-01-01", gratitude="sun", notes="")
+
+    first = run(db.upsert_daily_review(mit_done="no", mood=2, created_ts_utc=now, **common))
+    review = run(
+        db.upsert_daily_review(
+            mit_done="yes", mood=4, created_ts_utc=now + timedelta(hours=1), **common
+        )
+    )
+
+    assert (review.mit_done, review.mood) == ("yes", 4)
+    assert review.id == first.id != 0
+    with closing(sqlite3.connect(db.db_path)) as conn:
+        rows = conn.execute(
+            "SELECT id, mit_done, mood, created_ts_utc FROM daily_review"
+        ).fetchall()
+    assert rows == [(review.id, "yes", 4, int((now + timedelta(hours=1)).timestamp()))]
+
+
+
+def test_ensure_user_profile_registers_once(db: DBManager, run: Runner) -> None:
+    assert run(db.ensure_user_profile(1, 2)) is True
+    assert run(db.ensure_user_profile(1, 2)) is False
+
+    users = run(db.get_known_users())
+
+    assert [(user.chat_id, user.user_id, user.timezone.key) for user in users] == [
+        (1, 2, "Europe/Kyiv")
+    ]
+
+
+def test_claim_alert_only_succeeds_once(db: DBManager, run: Runner) -> None:
+    now = datetime(2030, 1, 1, tzinfo=UTC)
+    reminder, alerts = run(
+        db.create_reminder(
+            chat_id=1,
+            user_id=2,
+            text="gym",
+            event_ts_utc=now,
+            created_utc=now,
+            alert_times_utc=[now - timedelta(minutes=10)],
+        )
+    )
+
+    claimed = run(db.claim_alert(alerts[0].id))
+
+    assert claimed is not None
+    alert, claimed_reminder = claimed
+    assert alert.fired is True
+    assert claimed_reminder == reminder
+    assert run(db.claim_alert(alerts[0].id)) is None
+    assert run(db.claim_alert(9999)) is None
+
+
+def test_claim_alert_skips_archived_reminders(db: DBManager, run: Runner) -> None:
+    now = datetime(2030, 1, 1, tzinfo=UTC)
+    reminder, alerts = run(
+        db.create_reminder(
+            chat_id=1,
+            user_id=2,
+            text="gym",
+            event_ts_utc=now,
+            created_utc=now,
+            alert_times_utc=[now - timedelta(minutes=10)],
+        )
+    )
+    run(db.archive_reminder(reminder.id))
+
+    assert run(db.claim_alert(alerts[0].id)) is None
+    assert run(db.get_active_alerts_for_reminder(reminder.id)) == []
+
+
+
+def test_pending_alerts_include_later_same_day_and_skip_fired(db: DBManager, run: Runner) -> None:
+    now = datetime(2030, 1, 1, 12, 0, tzinfo=UTC)
+    reminder, alerts = run(
+        db.create_reminder(
+            chat_id=1,
+            user_id=2,
+            text="standup",
+            event_ts_utc=now + timedelta(hours=3),
+            created_utc=now,
+            alert_times_utc=[
+                now - timedelta(minutes=5),
+                now + timedelta(hours=2),
+                now + timedelta(hours=1),
+            ],
+        )
+    )
+    run(db.mark_alert_fired(alerts[2].id))
+
+    pending = run(db.get_pending_alerts(now))
+
+    assert [(alert.id, rem.id) for alert, rem in pending] == [(alerts[1].id, reminder.id)]
+
+
+
+def test_list_tasks_pages_with_keyset_cursor(db: DBManager, run: Runner) -> None:
+    now = datetime(2030, 1, 1, tzinfo=UTC)
+    created = [
+        run(db.create_task(chat_id=1, user_id=2, text=f"t{i}", created_utc=now))
+        for i in range(5)
+    ]
+
+    first = run(db.list_tasks(chat_id=1, user_id=2, archived=False, limit=2))
+    second = run(
+        db.list_tasks(
+            chat_id=1, user_id=2, archived=False, limit=2, before_id=first[-1].id
+        )
+    )
+    rest = run(
+        db.list_tasks(
+            chat_id=1, user_id=2, archived=False, limit=2, before_id=second[-1].id
+        )
+    )
+
+    assert [task.id for task in first + second + rest] == [task.id for task in reversed(created)]
+
+
+def test_list_tasks_returns_everything_by_default(db: DBManager, run: Runner) -> None:
+    now = datetime(2030, 1, 1, tzinfo=UTC)
+    for index in range(60):
+        run(db.create_task(chat_id=1, user_id=2, text=f"t{index}", created_utc=now))
+
+    tasks = run(db.list_tasks(chat_id=1, user_id=2, archived=False))
+
+    assert len(tasks) == 60
+
+
+
+def test_get_reminders_for_range_pages_after_cursor(db: DBManager, run: Runner) -> None:
+    event = datetime(2030, 1, 1, tzinfo=UTC)
+    for index in range(3):
+        run(
+            db.create_reminder(
+                chat_id=1,
+                user_id=2,
+                text=f"r{index}",
+                event_ts_utc=event,
+                created_utc=event,
+                alert_times_utc=[],
+            )
+        )
+
+    first = run(
+        db.get_reminders_for_range(
+            chat_id=1, user_id=2, start_utc=None, end_utc=None, archived=False, limit=2
+        )
+    )
+    rest = run(
+        db.get_reminders_for_range(
+            chat_id=1,
+            user_id=2,
+            start_utc=None,
+            end_utc=None,
+            archived=False,
+            limit=2,
+            after=(first[-1].event_ts_utc, first[-1].id),
+        )
+    )
+
+    assert [reminder.text for reminder in first + rest] == ["r0", "r1", "r2"]
+
+
+def test_bulk_archive_and_delete_tasks(db: DBManager, run: Runner) -> None:
+    now = datetime(2030, 1, 1, tzinfo=UTC)
+    tasks = [
+        run(db.create_task(chat_id=1, user_id=2, text=f"t{i}", created_utc=now))
+        for i in range(4)
+    ]
+
+    run(db.archive_tasks([tasks[0].id, tasks[1].id]))
+    run(db.delete_tasks([tasks[1].id, tasks[2].id]))
+    run(db.delete_tasks([]))
+
+    active = run(db.list_tasks(chat_id=1, user_id=2, archived=False))
+    archived = run(db.list_tasks(chat_id=1, user_id=2, archived=True))
+    assert [task.id for task in active] == [tasks[3].id]
+    assert [task.id for task in archived] == [tasks[0].id]
+
+
+def test_pool_never_opens_more_than_pool_size(tmp_path: Path, run: Runner) -> None:
+    manager = DBManager(tmp_path / "mentor.db", pool_size=2)
+    run(manager.init())
+
+    async def burst() -> None:
+        await asyncio.gather(
+            *(manager.list_tasks(chat_id=1, user_id=2, archived=False) for _ in range(10))
+        )
+
+    try:
+        run(burst())
+        assert len(manager._connections) == 2
+    finally:
+        run(manager.close())
+
+
+def test_reads_do_not_wait_for_an_open_write(db: DBManager, run: Runner) -> None:
+    now = datetime(2030, 1, 1, tzinfo=UTC)
+    task = run(db.create_task(chat_id=1, user_id=2, text="a", created_utc=now))
+
+    async def read_during_write() -> list:
+        async with db._transaction() as conn:
+            await conn.execute("UPDATE tasks SET archived = 1 WHERE id = ?", (task.id,))
+            return await asyncio.wait_for(
+                db.list_tasks(chat_id=1, user_id=2, archived=False), timeout=1
+            )
+
+    assert run(read_during_write()) == [task]
+    assert run(db.list_tasks(chat_id=1, user_id=2, archived=False)) == []